@@ -1,66 +1,237 @@
 import sys
-import subprocess
+import base64
+import collections
+import itertools
+import json
 import threading
-import time
 import logging
+import logging.handlers
 import psutil
 import os  # Add this import for os functions
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QTextEdit
-from PyQt5.QtCore import QThread, pyqtSignal, QTimer
+import requests
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QTextEdit, QTabWidget
+from PyQt5.QtCore import QThread, pyqtSignal, QTimer, QUrl, QEvent, QSocketNotifier, QMutex, QWaitCondition, QFileSystemWatcher
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 from colorama import init
 
+try:
+    import zmq  # Optional, enables block notifications instead of per-second polling
+except ImportError:
+    zmq = None
+
 # Initialize Colorama (For Windows Terminal Colors)
 init(autoreset=True)
 
 # Configurable Settings
-AEGISUM_CLI = "aegisum-cli.exe"  # Path to CLI
+AEGISUM_DATADIR = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "Aegisum")
+AEGISUM_CONF = os.path.join(AEGISUM_DATADIR, "aegisum.conf")
+CHAIN_SUBDIRS = {"main": "", "test": "testnet3", "regtest": "regtest"}  # Where each chain keeps its files, e.g. the auth cookie
+RPC_HOST = "127.0.0.1"  # Default RPC host, overridden by rpcconnect in aegisum.conf
+RPC_PORTS = {"main": 8332, "test": 18332, "regtest": 18443}  # Default RPC port per chain, overridden by rpcport
+RPC_TIMEOUT = 10  # Timeout in seconds for polling RPC calls
+POLL_INTERVAL = 1000  # Interval in milliseconds between node polls while the window is visible
+ZMQ_HEARTBEAT_INTERVAL = 30000  # Fallback poll interval in milliseconds once block notifications are active
 MINING_DELAY = 2  # Delay in seconds between mining attempts
+BLOCKS_PER_CALL = 10  # Blocks requested from each generatetoaddress call
+MINING_RESULT_INTERVAL = 50  # Interval in milliseconds between batched mining result updates
 LOG_FILE = "miner.log"
+LOG_CAPACITY = 1024  # Log records buffered in memory before being written out
+LOG_FLUSH_INTERVAL = 1000  # Max time in milliseconds a log record stays buffered
+LOG_VIEW_MAX_LINES = 5000  # Oldest lines are dropped from the log view past this
 running = False  # Mining state
 
-# Setup Logging
-logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format="%(asctime)s - %(message)s")
+# Setup Logging (buffered, written when full, on errors, or by the flush timer)
+log_file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")  # View Logs decodes the file as UTF-8
+log_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+log_handler = logging.handlers.MemoryHandler(LOG_CAPACITY, flushLevel=logging.ERROR, target=log_file_handler)
+logging.getLogger().addHandler(log_handler)
+logging.getLogger().setLevel(logging.INFO)
+
+class RpcError(Exception):
+    """Error returned by the aegisumd JSON-RPC server"""
+
+def read_rpc_config(conf_path):
+    """Read aegisum.conf, applying the section of the active chain over the global settings"""
+    sections = {"": {}}
+    section = ""
+    if os.path.exists(conf_path):
+        with open(conf_path, "r") as conf_file:
+            for line in conf_file:
+                line = line.split("#", 1)[0].strip()
+                if line.startswith("[") and line.endswith("]"):
+                    section = line[1:-1].strip()
+                    sections.setdefault(section, {})
+                elif line:
+                    key, _, value = line.partition("=")
+                    sections[section][key.strip()] = value.strip() if "=" in line else "1"  # Bare flags mean 1
+    config = dict(sections[""])
+    if config.get("regtest", "0") != "0":
+        chain = "regtest"
+    elif config.get("testnet", "0") != "0":
+        chain = "test"
+    else:
+        chain = config.get("chain", "main")
+    config.update(sections.get(chain, {}))
+    config["chain"] = chain
+    return config
+
+def rpc_address(config):
+    """Return the RPC host and port for the active chain, honoring rpcconnect and rpcport"""
+    host = config.get("rpcconnect", RPC_HOST)
+    port = config.get("rpcport")
+    if not host.startswith("[") and ":" in host:
+        host, connect_port = host.rsplit(":", 1)
+        port = port or connect_port  # rpcport wins over a port given in rpcconnect
+    default_port = RPC_PORTS.get(config["chain"], RPC_PORTS["main"])
+    try:
+        return host, int(port) if port else default_port
+    except ValueError:
+        logging.error(f"Invalid RPC port {port!r} in aegisum.conf, using {default_port}")
+        return host, default_port
+
+def rpc_cookie_path(config):
+    """Return the auth cookie path for the active chain, honoring datadir and rpccookiefile"""
+    datadir = os.path.expanduser(config.get("datadir", AEGISUM_DATADIR))
+    chain_dir = os.path.join(datadir, CHAIN_SUBDIRS.get(config["chain"], config["chain"]))
+    return os.path.join(chain_dir, config.get("rpccookiefile", ".cookie"))  # Relative paths are under the chain directory
+
+def read_rpc_cookie(cookie_path):
+    """Read the user and password from the auth cookie written by aegisumd"""
+    with open(cookie_path, "r") as cookie_file:
+        user, password = cookie_file.read().strip().split(":", 1)
+    return user, password
+
+class RpcClient:
+    """Long-lived JSON-RPC client for aegisumd, shared by the UI and the mining thread"""
+
+    def __init__(self, conf_path=AEGISUM_CONF):
+        self.config = read_rpc_config(conf_path)
+        host, port = rpc_address(self.config)
+        user, password = self.config.get("rpcuser", ""), self.config.get("rpcpassword", "")
+        self.host = host
+        self.url = f"http://{host}:{port}/"
+        self.uses_cookie = not user  # No rpcuser in aegisum.conf, authenticate with the cookie file
+        self.session = requests.Session()  # Keeps the HTTP connection alive between calls
+        self.set_auth(user, password)
+        self._ids = itertools.count(1)
+
+    def set_auth(self, user, password):
+        """Use these credentials for all following calls"""
+        self.session.auth = (user, password)
+        self.auth_header = b"Basic " + base64.b64encode(f"{user}:{password}".encode())  # For QNetworkRequest
+
+    def request(self, method, *params):
+        """Build a JSON-RPC request object with a fresh id"""
+        return {"jsonrpc": "1.0", "id": next(self._ids), "method": method, "params": list(params)}
+
+    def post(self, payload, timeout=RPC_TIMEOUT):
+        """POST a request or batch of requests and return the decoded body"""
+        response = self.session.post(self.url, json=payload, timeout=timeout)
+        try:
+            return response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise RpcError("Invalid response from aegisumd")
+
+    def call(self, method, *params, timeout=RPC_TIMEOUT):
+        """Call an RPC method and return its decoded result"""
+        return self.result(self.post(self.request(method, *params), timeout))
+
+    @classmethod
+    def results(cls, batch_requests, body):
+        """Match a batch reply to its requests by id and return the results in request order"""
+        if not isinstance(body, list):
+            cls.result(body)  # A batch rejected as a whole comes back as a single error object
+            raise RpcError("Expected a batch reply from aegisumd")
+        # Entries that are not objects with a plain id cannot answer any request
+        replies = {reply.get("id"): reply for reply in body
+                   if isinstance(reply, dict) and isinstance(reply.get("id"), (int, str))}
+        return [cls.result(replies.get(request["id"], {})) for request in batch_requests]
+
+    @staticmethod
+    def result(reply):
+        """Return the result of a single reply, raising RpcError on failure"""
+        if not isinstance(reply, dict):
+            raise RpcError("Malformed reply from aegisumd")
+        error = reply.get("error")
+        if error:
+            raise RpcError(error.get("message", error) if isinstance(error, dict) else error)
+        if "result" not in reply:
+            raise RpcError("Missing reply from aegisumd")
+        return reply["result"]
+
+class MessageQueue:
+    """Thread-safe queue of messages that the UI collects in batches"""
+
+    def __init__(self):
+        self._messages = collections.deque()
+        self._mutex = QMutex()
+
+    def put(self, message):
+        """Queue a message"""
+        self._mutex.lock()
+        try:
+            self._messages.append(message)
+        finally:
+            self._mutex.unlock()
+
+    def take_all(self):
+        """Remove and return all queued messages"""
+        self._mutex.lock()
+        try:
+            messages = list(self._messages)
+            self._messages.clear()
+        finally:
+            self._mutex.unlock()
+        return messages
 
 class MiningThread(QThread):
     """Thread for mining to avoid UI freezing"""
-    mining_result = pyqtSignal(str)
     blocks_mined_signal = pyqtSignal(int)  # Signal to update number of blocks mined
-    mining_data_signal = pyqtSignal(str)  # Signal to update mining data
     
-    def __init__(self, wallet_address):
+    def __init__(self, rpc, wallet_address, mining_results):
         super().__init__()
+        self.rpc = rpc
+        self.mining_results = mining_results  # Messages for the UI, collected by its timer
         self.wallet_address = wallet_address
         self.running = True
         self.blocks_mined = 0  # Tracks the number of blocks mined
+        self._mutex = QMutex()
+        self._wait = QWaitCondition()  # Woken by stop() to cut a delay short
 
     def run(self):
         """Mining process in background thread."""
         try:
             while self.running:
-                subprocess.run([AEGISUM_CLI, "generatetoaddress", "1", self.wallet_address], check=True)
-                self.blocks_mined += 1
-                self.blocks_mined_signal.emit(self.blocks_mined)  # Update mined blocks count
-                self.mining_result.emit("Block mined successfully!")
-                self.update_mining_data()  # Update mining data every cycle
-                time.sleep(MINING_DELAY)
-        except subprocess.CalledProcessError as e:
-            self.mining_result.emit(f"ERROR: Mining failed: {e}")
+                block_hashes = self.rpc.call("generatetoaddress", BLOCKS_PER_CALL, self.wallet_address, timeout=None)
+                if block_hashes:
+                    self.blocks_mined += len(block_hashes)
+                    self.blocks_mined_signal.emit(self.blocks_mined)  # Update mined blocks count
+                    self.mining_results.put(f"{len(block_hashes)} block(s) mined successfully!")
+                self.sleep_unless_stopped(MINING_DELAY)
+        except (requests.RequestException, RpcError) as e:
+            self.mining_results.put(f"ERROR: Mining failed: {e}")
             logging.error(f"Mining error: {e}")
-            self.mining_result.emit("Retrying in 5 seconds...")
-            time.sleep(5)
+            self.mining_results.put("Retrying in 5 seconds...")
+            self.sleep_unless_stopped(5)
+
+    def sleep_unless_stopped(self, seconds):
+        """Wait for the given delay, returning early if the thread is stopped."""
+        self._mutex.lock()
+        try:
+            if self.running:
+                self._wait.wait(self._mutex, int(seconds * 1000))
+        finally:
+            self._mutex.unlock()
 
     def stop(self):
         """Stop the mining process."""
-        self.running = False
-
-    def update_mining_data(self):
-        """Fetch mining data and update it."""
+        self._mutex.lock()
         try:
-            result = subprocess.check_output([AEGISUM_CLI, "getmininginfo"], text=True)
-            self.mining_data_signal.emit(result.strip())  # Send the raw result to the UI
-        except subprocess.CalledProcessError as e:
-            self.mining_result.emit(f"ERROR: Unable to fetch mining data: {e}")
-            logging.error(f"Mining data error: {e}")
+            self.running = False
+            self._wait.wakeAll()
+        finally:
+            self._mutex.unlock()
 
 class AppWindow(QWidget):
     """Main application window"""
@@ -70,8 +241,28 @@ class AppWindow(QWidget):
         self.setWindowTitle("Aegisum MinerUI version1.0")
         self.setGeometry(200, 200, 800, 600)
 
+        # Single RPC client shared by all timers and the mining thread
+        self.rpc = RpcClient()
+        self._cookie_mtime = None  # Modification time of the cookie last loaded
+        self.cookie_path = rpc_cookie_path(self.rpc.config)  # Used when aegisum.conf sets no rpcuser/rpcpassword
+        if self.rpc.uses_cookie:
+            # Reload the cookie whenever aegisumd rewrites it, e.g. on restart
+            self.cookie_watcher = QFileSystemWatcher(self)
+            self.cookie_watcher.fileChanged.connect(self._on_cookie_changed)
+            self.cookie_watcher.directoryChanged.connect(self._on_data_dir_changed)
+            self._on_data_dir_changed()
+        self._poll_reply = None  # Batched poll currently in flight
+        self._poll_again = False  # A poll was requested while another was in flight
+        self.zmq_socket = None
+        self.zmq_notifier = None
+        self._log_pos = 0  # Offset in LOG_FILE already shown in the log view
+        self._mining_address = None  # Wallet address reused for every mining session
+        self.mining_results = MessageQueue()
+        self._last_mining_info = None  # Last getmininginfo result shown
+
         # UI elements
         self.init_ui()
+        self.subscribe_block_notifications()
         
     def init_ui(self):
         """Initialize UI components"""
@@ -83,131 +274,382 @@ class AppWindow(QWidget):
         self.mining_data_label = QLabel("Mining Info: Fetching...")
         self.logs_text_edit = QTextEdit()
         self.logs_text_edit.setReadOnly(True)
+        self.logs_text_edit.document().setMaximumBlockCount(LOG_VIEW_MAX_LINES)
+        self.log_file_text_edit = QTextEdit()  # Tail of LOG_FILE, kept apart from the live messages
+        self.log_file_text_edit.setReadOnly(True)
+        self.log_file_text_edit.document().setMaximumBlockCount(LOG_VIEW_MAX_LINES)
+        self.log_tabs = QTabWidget()
+        self.log_tabs.addTab(self.logs_text_edit, "Activity")
+        self.log_tabs.addTab(self.log_file_text_edit, "Log File")
 
         # Buttons for actions
         self.start_button = QPushButton("Start Mining")
         self.stop_button = QPushButton("Stop Mining")
         self.check_balance_button = QPushButton("Check Balance")
         self.view_logs_button = QPushButton("View Logs")
+        self.new_address_button = QPushButton("Regenerate Address")
 
         # Layout setup
         layout.addWidget(self.status_label)
         layout.addWidget(self.balance_label)
         layout.addWidget(self.mining_data_label)
-        layout.addWidget(self.logs_text_edit)
+        layout.addWidget(self.log_tabs)
         layout.addWidget(self.start_button)
         layout.addWidget(self.stop_button)
         layout.addWidget(self.check_balance_button)
         layout.addWidget(self.view_logs_button)
+        layout.addWidget(self.new_address_button)
 
         self.setLayout(layout)
 
+        # Asynchronous HTTP client so RPC polling never blocks the UI thread
+        self.nam = QNetworkAccessManager(self)
+
         # Connect buttons to their functions
         self.start_button.clicked.connect(self.start_mining)
         self.stop_button.clicked.connect(self.stop_mining)
         self.check_balance_button.clicked.connect(self.check_balance)
         self.view_logs_button.clicked.connect(self.view_logs)
+        self.new_address_button.clicked.connect(self.regenerate_address)
+
+        # Timer for real-time balance and mining data update
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_node)
+        self.poll_timer.start(POLL_INTERVAL)
 
-        # Timer for real-time balance check
-        self.balance_timer = QTimer(self)
-        self.balance_timer.timeout.connect(self.check_balance)
-        self.balance_timer.start(1000)  # Update every second
+        # Timer bounding how long log records stay in the memory buffer
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.timeout.connect(log_handler.flush)
+        self.log_flush_timer.start(LOG_FLUSH_INTERVAL)
 
-        # Timer for real-time mining data update
-        self.mining_data_timer = QTimer(self)
-        self.mining_data_timer.timeout.connect(self.fetch_mining_data)
-        self.mining_data_timer.start(1000)  # Update every second
+        # Timer collecting queued mining results while mining runs
+        self.mining_result_timer = QTimer(self)
+        self.mining_result_timer.timeout.connect(self.collect_mining_results)
 
     def start_mining(self):
         """Start mining when the button is clicked"""
-        wallet_address = self.get_wallet_address()
-        if wallet_address:
-            self.mining_thread = MiningThread(wallet_address)
-            self.mining_thread.mining_result.connect(self.update_mining_result)
-            self.mining_thread.blocks_mined_signal.connect(self.update_mining_status)
-            self.mining_thread.mining_data_signal.connect(self.update_mining_data)
-            self.mining_thread.start()
-            self.status_label.setText("Status: Mining started...")
-            self.start_button.setEnabled(False)
-            self.stop_button.setEnabled(True)
+        self.start_button.setEnabled(False)
+        if self._mining_address is None:
+            self.set_label_text(self.status_label, "Status: Getting wallet address...")
+            self.request_wallet_address(start_mining=True)  # Mining starts once the address arrives
         else:
-            self.update_mining_result("Error: Could not get wallet address.")
+            self.start_mining_thread(self._mining_address)
+
+    def start_mining_thread(self, wallet_address):
+        """Start the mining thread for the given address"""
+        self.mining_thread = MiningThread(self.rpc, wallet_address, self.mining_results)
+        self.mining_thread.blocks_mined_signal.connect(self.update_mining_status)
+        self.mining_thread.finished.connect(self._on_mining_finished)
+        self.mining_thread.start()
+        self.mining_result_timer.start(MINING_RESULT_INTERVAL)
+        self.set_label_text(self.status_label, "Status: Mining started...")
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
 
     def stop_mining(self):
         """Stop mining when the button is clicked"""
         if hasattr(self, 'mining_thread') and self.mining_thread.isRunning():
             self.mining_thread.stop()
-            self.status_label.setText("Status: Mining stopped.")
-            self.start_button.setEnabled(True)
+            # A generatetoaddress call in flight has to finish first, Start stays disabled until then
+            self.set_label_text(self.status_label, "Status: Stopping...")
             self.stop_button.setEnabled(False)
 
+    def _on_mining_finished(self):
+        """Allow mining to be started again once the mining thread has exited"""
+        self.set_label_text(self.status_label, "Status: Mining stopped.")
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def load_rpc_auth(self):
+        """Read the aegisumd auth cookie and hand the credentials to the RPC client"""
+        try:
+            self._cookie_mtime = os.stat(self.cookie_path).st_mtime_ns
+            self.rpc.set_auth(*read_rpc_cookie(self.cookie_path))
+        except (OSError, ValueError) as e:
+            logging.error(f"Error reading RPC cookie: {e}")
+
+    def _on_cookie_changed(self, path):
+        """Reload the credentials when the watched cookie file is rewritten"""
+        if not os.path.exists(self.cookie_path):
+            return  # Removed on daemon shutdown, the directory watch picks up its return
+        if self.cookie_path not in self.cookie_watcher.files():
+            self.cookie_watcher.addPath(self.cookie_path)  # Replacing a file drops it from the watcher
+        self.load_rpc_auth()
+
+    def _on_data_dir_changed(self, path=None):
+        """Start watching the cookie once it exists, reloading only if it was recreated"""
+        # Watch the cookie's directory, or the nearest existing one above it until it is created
+        watch_dir = os.path.dirname(self.cookie_path)
+        while not os.path.isdir(watch_dir) and os.path.dirname(watch_dir) != watch_dir:
+            watch_dir = os.path.dirname(watch_dir)
+        if os.path.isdir(watch_dir) and watch_dir not in self.cookie_watcher.directories():
+            self.cookie_watcher.addPath(watch_dir)
+        try:
+            mtime = os.stat(self.cookie_path).st_mtime_ns
+        except OSError:
+            return  # No cookie yet; other files in the data directory are ignored
+        if self.cookie_path not in self.cookie_watcher.files():
+            self.cookie_watcher.addPath(self.cookie_path)
+        if mtime != self._cookie_mtime:
+            self.load_rpc_auth()
+
+    def post_rpc(self, payload, slot):
+        """Send a JSON-RPC payload without blocking and pass the reply to slot when it finishes"""
+        request = QNetworkRequest(QUrl(self.rpc.url))
+        request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+        request.setRawHeader(b"Authorization", self.rpc.auth_header)
+        if hasattr(request, "setTransferTimeout"):  # Qt 5.15 and later
+            request.setTransferTimeout(RPC_TIMEOUT * 1000)
+        reply = self.nam.post(request, json.dumps(payload).encode())
+        if not hasattr(request, "setTransferTimeout"):
+            # Older Qt: abort the reply ourselves; the timer is deleted along with the reply
+            timeout_timer = QTimer(reply)
+            timeout_timer.setSingleShot(True)
+            timeout_timer.timeout.connect(reply.abort)
+            timeout_timer.start(RPC_TIMEOUT * 1000)
+        reply.finished.connect(lambda: slot(reply, payload))
+        return reply
+
+    def read_rpc_reply(self, reply):
+        """Decode the body of a finished RPC reply, raising RpcError on transport errors"""
+        reply.deleteLater()
+        data = bytes(reply.readAll())
+        if not data and reply.error() != QNetworkReply.NoError:
+            raise RpcError(reply.errorString())
+        try:
+            return json.loads(data)
+        except ValueError:
+            raise RpcError(reply.errorString() if reply.error() != QNetworkReply.NoError else "Invalid response from aegisumd")
+
     def check_balance(self):
         """Check the wallet balance"""
+        self.post_rpc(self.rpc.request("getbalance"), self._on_balance_reply)
+
+    def _on_balance_reply(self, reply, request):
+        """Show the balance returned by getbalance"""
         try:
-            result = subprocess.check_output([AEGISUM_CLI, "getbalance"], text=True).strip()
-            self.balance_label.setText(f"Balance: {result} AEG")
+            result = self.rpc.result(self.read_rpc_reply(reply))
+            self.set_label_text(self.balance_label, f"Balance: {result} AEG")
             logging.info(f"Checked balance: {result} AEG")
-        except subprocess.CalledProcessError as e:
-            self.balance_label.setText(f"ERROR: {e}")
+        except RpcError as e:
+            self.set_label_text(self.balance_label, f"ERROR: {e}")
             logging.error(f"Error checking balance: {e}")
 
     def view_logs(self):
-        """Display logs in the text edit area"""
-        if os.path.exists(LOG_FILE) and os.path.getsize(LOG_FILE) > 0:
-            with open(LOG_FILE, "r") as log_file:
-                self.logs_text_edit.setText(log_file.read())
-        else:
-            self.logs_text_edit.setText("No logs found or log file is empty.")
+        """Display logs in the log file tab"""
+        self.log_tabs.setCurrentWidget(self.log_file_text_edit)
+        log_handler.flush()  # Make sure buffered records are on disk
+        if not os.path.exists(LOG_FILE) or os.path.getsize(LOG_FILE) == 0:
+            self._log_pos = 0
+            self.log_file_text_edit.setText("No logs found or log file is empty.")
+            return
+        if os.path.getsize(LOG_FILE) < self._log_pos:
+            self._log_pos = 0  # Log file was truncated or replaced
+        if self._log_pos == 0:
+            self.log_file_text_edit.clear()  # Reading from the start, drop any earlier contents
+        with open(LOG_FILE, "rb") as log_file:
+            log_file.seek(self._log_pos)  # Only read what was written since the last view
+            new_logs = log_file.read()
+            self._log_pos = log_file.tell()
+        if new_logs:
+            self.log_file_text_edit.append(new_logs.decode("utf-8", "replace").rstrip("\r\n"))
+
+    def set_label_text(self, label, text):
+        """Set a label's text, skipping the relayout when it is unchanged"""
+        if label.text() != text:
+            label.setText(text)
 
     def update_mining_result(self, message):
         """Update the mining result in logs and status"""
         self.logs_text_edit.append(message)
         logging.info(message)
 
+    def collect_mining_results(self):
+        """Show all mining results queued since the last call in one update"""
+        messages = self.mining_results.take_all()
+        if messages:
+            self.update_mining_result("\n".join(messages))
+        elif not self.mining_thread.isRunning():
+            self.mining_result_timer.stop()  # Mining finished and every result was shown
+
     def update_mining_status(self, blocks_mined):
         """Update the mining status with number of blocks mined"""
-        self.status_label.setText(f"Status: Mining... {blocks_mined} blocks mined.")
+        self.set_label_text(self.status_label, f"Status: Mining... {blocks_mined} blocks mined.")
 
-    def update_mining_data(self, raw_data):
+    def update_mining_data(self, data):
         """Update the UI with mining data"""
+        if data == self._last_mining_info:
+            return  # Nothing changed since the last poll
         try:
-            mining_info = self.format_mining_data(raw_data)
-            self.mining_data_label.setText(mining_info)
-        except Exception as e:
+            mining_info = self.format_mining_data(data)
+            self.set_label_text(self.mining_data_label, mining_info)
+            self._last_mining_info = data
+        except (AttributeError, TypeError) as e:
             logging.error(f"Error formatting mining data: {e}")
 
-    def fetch_mining_data(self):
-        """Fetch mining data every second and update UI"""
+    def poll_node(self):
+        """Fetch mining data and balance in a single batched request"""
+        if self._poll_reply is not None:
+            self._poll_again = True  # Poll again once the previous one answers
+            return
+        batch_requests = [self.rpc.request("getmininginfo"), self.rpc.request("getbalance")]
+        self._poll_reply = self.post_rpc(batch_requests, self._on_poll_reply)
+
+    def _on_poll_reply(self, reply, batch_requests):
+        """Dispatch the batched poll results to the mining data and balance labels"""
+        self._poll_reply = None
+        if self._poll_again:
+            self._poll_again = False
+            QTimer.singleShot(0, self.poll_node)
         try:
-            result = subprocess.check_output([AEGISUM_CLI, "getmininginfo"], text=True)
-            self.update_mining_data(result.strip())  # Update UI with real-time mining data
-        except subprocess.CalledProcessError as e:
-            self.mining_result.emit(f"ERROR: Unable to fetch mining data: {e}")
+            mining_info, balance = self.rpc.results(batch_requests, self.read_rpc_reply(reply))
+            self.update_mining_data(mining_info)  # Update UI with real-time mining data
+            self.set_label_text(self.balance_label, f"Balance: {balance} AEG")
+        except RpcError as e:
+            self._last_mining_info = None  # Redraw the data once the node answers again
+            self.set_label_text(self.mining_data_label, f"ERROR: Unable to fetch mining data: {e}")
             logging.error(f"Mining data error: {e}")
 
-    def format_mining_data(self, raw_data):
-        """Format raw mining data into a readable string"""
-        data = eval(raw_data)  # This assumes the mining data is returned as a dictionary-like string
+    def subscribe_block_notifications(self):
+        """Ask the node whether it publishes hashblock notifications over ZMQ"""
+        if zmq is not None:
+            self.post_rpc(self.rpc.request("getzmqnotifications"), self._on_zmq_notifications_reply)
+
+    def _on_zmq_notifications_reply(self, reply, request):
+        """Subscribe to hashblock and slow the poll timer down to a heartbeat"""
+        try:
+            notifications = self.rpc.result(self.read_rpc_reply(reply))
+        except RpcError as e:
+            logging.info(f"Block notifications unavailable, polling instead: {e}")
+            return
+        try:
+            addresses = [n["address"] for n in notifications if n.get("type") == "pubhashblock"]
+            if not addresses:
+                return
+            # The node reports its bind address, which may be a wildcard
+            address = addresses[0].replace("0.0.0.0", self.rpc.host).replace("*", self.rpc.host)
+            self.zmq_socket = zmq.Context.instance().socket(zmq.SUB)
+            self.zmq_socket.setsockopt(zmq.SUBSCRIBE, b"hashblock")
+            self.zmq_socket.connect(address)
+            self.zmq_notifier = QSocketNotifier(self.zmq_socket.getsockopt(zmq.FD), QSocketNotifier.Read, self)
+        except (zmq.ZMQError, KeyError, TypeError, AttributeError) as e:
+            logging.error(f"Block notifications unavailable, polling instead: {e}")
+            self.close_block_notifications()
+            return
+        self.zmq_notifier.activated.connect(self._on_zmq_ready)
+        self.poll_timer.setInterval(ZMQ_HEARTBEAT_INTERVAL)
+        logging.info(f"Subscribed to block notifications at {address}")
+
+    def close_block_notifications(self):
+        """Stop watching and close the block subscription, falling back to regular polling"""
+        if self.zmq_notifier is not None:
+            self.zmq_notifier.setEnabled(False)
+            self.zmq_notifier.deleteLater()
+            self.zmq_notifier = None
+        if self.zmq_socket is not None:
+            self.zmq_socket.close(linger=0)
+            self.zmq_socket = None
+        self.poll_timer.setInterval(POLL_INTERVAL)
+
+    def _on_zmq_ready(self):
+        """Drain pending block notifications and refresh once"""
+        if self.zmq_socket is None:
+            return  # Subscription was closed while the notification was queued
+        self.zmq_notifier.setEnabled(False)
+        new_block = False
+        try:
+            # The ZMQ descriptor is edge-triggered, so read until no message is left
+            while self.zmq_socket.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+                self.zmq_socket.recv_multipart(zmq.NOBLOCK)
+                new_block = True
+        except zmq.ZMQError as e:
+            logging.error(f"Block notifications failed, polling instead: {e}")
+            self.close_block_notifications()
+            return
+        self.zmq_notifier.setEnabled(True)
+        if new_block and self.poll_timer.isActive():
+            self.poll_node()
+
+    def format_mining_data(self, data):
+        """Format the decoded getmininginfo result into a readable string"""
+        warnings = data.get("warnings", "")
+        if isinstance(warnings, list):  # Newer nodes return warnings as a list
+            warnings = "; ".join(warnings)
         mining_info = (
-            f"Blocks: {data['blocks']}\n"
-            f"Current Block Weight: {data['currentblockweight']}\n"
-            f"Difficulty: {data['difficulty']}\n"
-            f"Network Hashrate (H/s): {data['networkhashps']}\n"
-            f"Pooled Transactions: {data['pooledtx']}\n"
-            f"Chain: {data['chain']}\n"
-            f"Warnings: {data['warnings']}"
+            f"Blocks: {data.get('blocks', 'N/A')}\n"
+            f"Current Block Weight: {data.get('currentblockweight', 'N/A')}\n"  # Only present once a block template exists
+            f"Difficulty: {data.get('difficulty', 'N/A')}\n"
+            f"Network Hashrate (H/s): {data.get('networkhashps', 'N/A')}\n"
+            f"Pooled Transactions: {data.get('pooledtx', 'N/A')}\n"
+            f"Chain: {data.get('chain', 'N/A')}\n"
+            f"Warnings: {warnings}"
         )
         return mining_info
 
-    def get_wallet_address(self):
-        """Retrieve a new wallet address for mining"""
+    def regenerate_address(self):
+        """Replace the cached mining address with a fresh one from the wallet"""
+        self.new_address_button.setEnabled(False)
+        self.request_wallet_address(start_mining=False)
+
+    def request_wallet_address(self, start_mining):
+        """Ask the wallet for a new mining address without blocking the UI"""
+        self.post_rpc(self.rpc.request("getnewaddress"),
+                      lambda reply, request: self._on_address_reply(reply, request, start_mining))
+
+    def _on_address_reply(self, reply, request, start_mining):
+        """Cache the new wallet address and start mining if Start was clicked"""
+        self.new_address_button.setEnabled(True)
         try:
-            result = subprocess.check_output([AEGISUM_CLI, "getnewaddress"], text=True).strip()
-            return result
-        except subprocess.CalledProcessError as e:
+            wallet_address = self.rpc.result(self.read_rpc_reply(reply))
+        except RpcError as e:
             self.logs_text_edit.append(f"ERROR: Failed to retrieve wallet address: {e}")
             logging.error(f"Error getting wallet address: {e}")
-            return None
+            if start_mining:
+                self.update_mining_result("Error: Could not get wallet address.")
+                self.set_label_text(self.status_label, "Status: Waiting to start mining...")
+                self.start_button.setEnabled(True)
+            return
+        self._mining_address = wallet_address
+        if start_mining:
+            self.start_mining_thread(wallet_address)
+        else:
+            self.update_mining_result(f"New mining address: {wallet_address}")
+
+    def set_polling(self, active):
+        """Start or stop polling the node, refreshing immediately when resumed"""
+        if active and not self.poll_timer.isActive():
+            self.poll_node()
+            self.poll_timer.start()
+        elif not active:
+            self.poll_timer.stop()
+
+    def changeEvent(self, event):
+        """Pause polling while the window is minimized"""
+        if event.type() == QEvent.WindowStateChange:
+            self.set_polling(not self.isMinimized())
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        """Resume polling when the window is shown"""
+        self.set_polling(not self.isMinimized())
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Pause polling while the window is hidden"""
+        self.set_polling(False)
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        """Stop mining, close the block subscription and flush buffered logs before the window closes"""
+        if hasattr(self, 'mining_thread'):
+            self.mining_thread.stop()
+            self.mining_thread.wait()  # Its last records must be logged before shutdown
+            self.collect_mining_results()
+        self.mining_result_timer.stop()
+        self.log_flush_timer.stop()
+        self.close_block_notifications()
+        logging.shutdown()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":